@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import platform
 import random
+import re
 import shutil
+import threading
 import time
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+try:
+    # the lexbor backend is the only one left in selectolax 1.0
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    # selectolax is optional; fall back to a plain regex scan
+    HTMLParser = None
+
 from .cache import MemoryCache, read_json, write_json
 from .config import PubMedMCPConfig, ensure_directories
 from .http import ProxyConfig, PubMedHTTPClient
@@ -21,11 +32,117 @@ PUBMED_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 PMC_BASE_URL = "https://www.ncbi.nlm.nih.gov/pmc"
 UNPAYWALL_API_URL = "https://api.unpaywall.org/v2"
 
+_PMCID_RE = re.compile(r"PMC\d+")
+
+_SORT_MAP = {
+    "relevance": "relevance",
+    "date": "pub+date",
+    "pubdate": "pub+date",
+}
+
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+@functools.lru_cache(maxsize=4)
+def _iso_at(sec: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+
+
+def _now_iso() -> str:
+    # Index writes stamp several fields per call; format each second only once.
+    return _iso_at(int(time.time()))
+
+
+@functools.lru_cache(maxsize=8)
+def _which(name: str) -> Optional[str]:
+    return shutil.which(name)
+
+
+def _compute_system_check() -> Dict[str, Any]:
+    system_info = {
+        "platform": platform.system().lower(),
+        "arch": platform.machine(),
+        "isWindows": os.name == "nt",
+        "isMacOS": platform.system() == "Darwin",
+        "isLinux": platform.system() == "Linux",
+    }
+
+    tools = []
+    if system_info["isWindows"]:
+        tools.append({"name": "PowerShell", "available": _which("powershell") is not None})
+    else:
+        for tool_name in ("wget", "curl"):
+            tools.append({"name": tool_name, "available": _which(tool_name) is not None})
+
+    return {
+        "system": system_info,
+        "tools": tools,
+        "recommended": "powershell" if system_info["isWindows"] else ("wget" if _which("wget") else "curl"),
+    }
+
+
+# Platform and PATH do not change while the process runs; computed once at import.
+_SYSTEM_CHECK: Optional[Dict[str, Any]] = _compute_system_check()
+
+
+def invalidate_system_check_cache() -> None:
+    """Forget cached tool lookups, e.g. after installing wget or curl."""
+
+    global _SYSTEM_CHECK
+    _SYSTEM_CHECK = None
+    _which.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _build_query_cached(query: str, days_back: int, minute_bucket: int) -> str:
+    if days_back <= 0:
+        return query
+    date = time.strftime("%Y/%m/%d", time.gmtime(minute_bucket * 60 - days_back * 24 * 60 * 60))
+    return f'{query} AND ("{date}"[Date - Publication] : "3000"[Date - Publication])'
+
+
+@dataclass
+class Article:
+    """PubMed article record; attribute names match the serialized keys."""
+
+    __slots__ = (
+        "pmid",
+        "title",
+        "authors",
+        "journal",
+        "publicationDate",
+        "volume",
+        "issue",
+        "pages",
+        "abstract",
+        "doi",
+        "url",
+        "publicationTypes",
+        "meshTerms",
+        "keywords",
+    )
+
+    pmid: str
+    title: str
+    authors: List[str]
+    journal: str
+    publicationDate: str
+    volume: str
+    issue: str
+    pages: str
+    abstract: Optional[str]
+    doi: str
+    url: str
+    publicationTypes: List[str]
+    meshTerms: List[str]
+    keywords: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 @dataclass
 class OpenAccessInfo:
     is_open_access: bool
@@ -33,6 +150,14 @@ class OpenAccessInfo:
     download_url: Optional[str]
     pmcid: Optional[str]
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_open_access": self.is_open_access,
+            "sources": list(self.sources),
+            "download_url": self.download_url,
+            "pmcid": self.pmcid,
+        }
+
 
 class PubMedMCPBackend:
     """Python port of the Node pubmed-data-server logic."""
@@ -41,8 +166,14 @@ class PubMedMCPBackend:
         self.config = config
         ensure_directories(config)
 
+        # Per-PMID cache paths are built by string concatenation; Path joins
+        # are comparatively slow in batch loops.
+        self._paper_cache_prefix = os.fspath(config.paper_cache_dir) + os.sep
+        self._fulltext_cache_prefix = os.fspath(config.fulltext_cache_dir) + os.sep
+        self._endnote_cache_prefix = os.fspath(config.endnote_cache_dir) + os.sep
+
         self.http = PubMedHTTPClient(
-            proxy_config=ProxyConfig(
+            proxy_config=ProxyConfig.build(
                 enabled=config.proxy_enabled,
                 http_proxy=config.http_proxy,
                 https_proxy=config.https_proxy,
@@ -53,6 +184,8 @@ class PubMedMCPBackend:
             rate_limit_delay_ms=config.rate_limit_delay_ms,
             proxy_timeout=config.proxy_timeout,
             proxy_retry_count=config.proxy_retry_count,
+            tool_name=config.pubmed_tool_name,
+            email=config.pubmed_email,
         )
 
         self.memory_cache = MemoryCache(
@@ -60,7 +193,19 @@ class PubMedMCPBackend:
             max_size=config.cache_max_size,
         )
 
+        # ESummary lookups issued by concurrent callers within the batch
+        # window are merged into a single request.
+        self._pending_lock = threading.Lock()
+        self._pending_pmids: Dict[str, Future] = {}
+        self._pending_batch: List[str] = []
+        self._batch_leader_active = False
+
         self._ensure_indexes()
+        # PMIDs with no PMC copy, mapped to when the miss was seen; misses
+        # mark the map dirty and flush_no_pmc() persists it
+        self._no_pmc_lock = threading.Lock()
+        self._no_pmc = self._load_no_pmc()
+        self._no_pmc_dirty = False
 
     # ------------------------------------------------------------------
     # Setup helpers
@@ -76,7 +221,7 @@ class PubMedMCPBackend:
                 endnote_index,
                 {
                     "version": self.config.cache_version,
-                    "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "created": _now_iso(),
                     "exported_papers": {},
                     "stats": {"totalExports": 0, "risFiles": 0, "bibtexFiles": 0, "lastExport": None},
                 },
@@ -94,13 +239,47 @@ class PubMedMCPBackend:
             params["api_key"] = self.config.pubmed_api_key
         return params
 
-    def search_pubmed(self, query: str, max_results: int, days_back: int, sort_by: str) -> Dict[str, Any]:
-        cache_key = f"{query}|{max_results}|{days_back}|{sort_by}"
+    def search_pubmed(
+        self,
+        query: str,
+        max_results: int,
+        days_back: int,
+        sort_by: str,
+        include_abstract: bool = True,
+    ) -> Dict[str, Any]:
+        cache_key = f"{query}|{max_results}|{days_back}|{sort_by}|{int(include_abstract)}"
+        now = _now_ms()
+        cached = self.memory_cache.get(cache_key, now)
+        if cached is not None:
+            return cached
+
+        id_list, total, term = self._esearch(query, max_results, days_back, sort_by)
+
+        if not id_list:
+            result = {"articles": [], "total": total, "query": term}
+            self.memory_cache.set(cache_key, result, now)
+            return result
+
+        articles = self.fetch_article_details(id_list, include_abstract=include_abstract)
+        result = {"articles": articles, "total": total, "query": term}
+        self.memory_cache.set(cache_key, result, now)
+        return result
+
+    def search_ids_only(self, query: str, max_results: int) -> Dict[str, Any]:
+        """Run ESearch only and return matching PMIDs without article details."""
+
+        cache_key = f"ids|{query}|{max_results}"
         now = _now_ms()
         cached = self.memory_cache.get(cache_key, now)
         if cached is not None:
             return cached
 
+        id_list, total, term = self._esearch(query, max_results, 0, "relevance")
+        result = {"ids": id_list, "total": total, "query": term}
+        self.memory_cache.set(cache_key, result, now)
+        return result
+
+    def _esearch(self, query: str, max_results: int, days_back: int, sort_by: str) -> Tuple[List[str], int, str]:
         params = self._base_params()
         params.update(
             {
@@ -108,7 +287,7 @@ class PubMedMCPBackend:
                 "term": self._build_query(query, days_back),
                 "retmode": "json",
                 "retmax": str(max_results),
-                "sort": self._map_sort(sort_by),
+                "sort": _SORT_MAP.get(sort_by.lower(), "relevance"),
             }
         )
 
@@ -116,57 +295,119 @@ class PubMedMCPBackend:
         payload = response.json()
         id_list: List[str] = payload.get("esearchresult", {}).get("idlist", [])
         total = int(payload.get("esearchresult", {}).get("count", 0))
-
-        if not id_list:
-            result = {"articles": [], "total": total, "query": params["term"]}
-            self.memory_cache.set(cache_key, result, now)
-            return result
-
-        articles = self.fetch_article_details(id_list)
-        result = {"articles": articles, "total": total, "query": params["term"]}
-        self.memory_cache.set(cache_key, result, now)
-        return result
+        return id_list, total, params["term"]
 
     def _build_query(self, query: str, days_back: int) -> str:
-        if days_back <= 0:
-            return query
-        date = time.strftime("%Y/%m/%d", time.gmtime(time.time() - days_back * 24 * 60 * 60))
-        return f'{query} AND ("{date}"[Date - Publication] : "3000"[Date - Publication])'
-
-    def _map_sort(self, sort_by: str) -> str:
-        mapping = {
-            "relevance": "relevance",
-            "date": "pub+date",
-            "pubdate": "pub+date",
-        }
-        return mapping.get(sort_by.lower(), "relevance")
+        return _build_query_cached(query, days_back, int(time.time()) // 60)
 
     # ------------------------------------------------------------------
     # Article details & caching
     # ------------------------------------------------------------------
-    def fetch_article_details(self, ids: Sequence[str]) -> List[Dict[str, Any]]:
-        articles: List[Dict[str, Any]] = []
+    def fetch_article_details(self, ids: Sequence[str], include_abstract: bool = True) -> List[Article]:
+        cache_results: Dict[str, Article] = {}
         uncached: List[str] = []
 
         for pmid in ids:
             cached = self._read_article_cache(pmid)
             if cached:
-                articles.append(cached)
+                cache_results[pmid] = cached
             else:
                 uncached.append(pmid)
 
-        if uncached:
-            fetched = self._fetch_from_pubmed(uncached)
-            for article in fetched:
-                self._write_article_cache(article["pmid"], article)
-            articles.extend(fetched)
+        if not uncached:
+            return [cache_results[pmid] for pmid in ids]
+
+        fetched = self._fetch_from_pubmed(uncached)
+        deep = self.config.abstract_mode == "deep"
+        for pmid, article in fetched.items():
+            if deep:
+                if not include_abstract:
+                    # skip the per-article EFetch; the record is incomplete, so
+                    # leave it out of the file cache
+                    continue
+                self._fetch_deep_abstract(article)
+            self._write_article_cache(pmid, article)
 
         # preserve input order
-        index = {article["pmid"]: article for article in articles}
-        ordered = [index[pmid] for pmid in ids if pmid in index]
-        return ordered
+        return [
+            cache_results[pmid] if pmid in cache_results else fetched[pmid]
+            for pmid in ids
+            if pmid in cache_results or pmid in fetched
+        ]
+
+    def _fetch_from_pubmed(self, ids: Sequence[str]) -> Dict[str, Article]:
+        window_ms = self.config.esummary_batch_window_ms
+        if window_ms <= 0:
+            return self._fetch_esummary(ids)
+
+        futures: Dict[str, Future] = {}
+        added = False
+        with self._pending_lock:
+            for pmid in ids:
+                future = self._pending_pmids.get(pmid)
+                if future is None:
+                    future = Future()
+                    self._pending_pmids[pmid] = future
+                    self._pending_batch.append(pmid)
+                    added = True
+                futures[pmid] = future
+            # callers whose PMIDs are all in flight just wait for them
+            leader = added and not self._batch_leader_active
+            if leader:
+                self._batch_leader_active = True
+
+        if leader:
+            try:
+                time.sleep(window_ms / 1000.0)
+            except BaseException as exc:
+                self._fail_batch(self._take_pending_batch(), exc)
+                raise
+            self._flush_pending_batch()
+
+        # bound the wait so a lost leader cannot hang every later fetch
+        wait_s = (window_ms + self.config.request_timeout_ms * (self.config.proxy_retry_count + 2)) / 1000.0
+        articles: Dict[str, Article] = {}
+        for pmid, future in futures.items():
+            article = future.result(timeout=wait_s)
+            if article is not None:
+                articles[pmid] = article
+        return articles
 
-    def _fetch_from_pubmed(self, ids: Sequence[str]) -> List[Dict[str, Any]]:
+    def _take_pending_batch(self) -> List[str]:
+        with self._pending_lock:
+            batch = self._pending_batch
+            self._pending_batch = []
+            self._batch_leader_active = False
+        return batch
+
+    def _fail_batch(self, batch: List[str], exc: BaseException) -> None:
+        if not isinstance(exc, Exception):
+            # don't re-raise KeyboardInterrupt and friends in waiting threads
+            exc = RuntimeError(f"ESummary batch interrupted: {exc!r}")
+        with self._pending_lock:
+            futures = [self._pending_pmids.pop(pmid) for pmid in batch]
+        for future in futures:
+            future.set_exception(exc)
+
+    def _flush_pending_batch(self) -> None:
+        batch = self._take_pending_batch()
+        if not batch:
+            return
+
+        try:
+            fetched = self._fetch_esummary(batch)
+        except BaseException as exc:
+            self._fail_batch(batch, exc)
+            if isinstance(exc, Exception):
+                return
+            raise
+
+        with self._pending_lock:
+            futures = [self._pending_pmids.pop(pmid) for pmid in batch]
+        for pmid, future in zip(batch, futures):
+            future.set_result(fetched.get(pmid))
+
+    def _fetch_esummary(self, ids: Sequence[str]) -> Dict[str, Article]:
         params = self._base_params()
         params.update(
             {
@@ -179,38 +420,37 @@ class PubMedMCPBackend:
         data = response.json()
         result = data.get("result", {})
 
-        articles: List[Dict[str, Any]] = []
+        articles: Dict[str, Article] = {}
         for pmid in ids:
             raw = result.get(pmid)
             if not raw:
                 continue
-            article = {
-                "pmid": pmid,
-                "title": raw.get("title", "No title"),
-                "authors": [author.get("name") for author in raw.get("authors", []) if author.get("name")],
-                "journal": raw.get("source", "No journal"),
-                "publicationDate": raw.get("pubdate", "No date"),
-                "volume": raw.get("volume", ""),
-                "issue": raw.get("issue", ""),
-                "pages": raw.get("pages", ""),
-                "abstract": raw.get("abstract"),
-                "doi": raw.get("elocationid", ""),
-                "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                "publicationTypes": raw.get("pubtype", []),
-                "meshTerms": raw.get("meshterms", []),
-                "keywords": raw.get("keywords", []),
-            }
-
-            if self.config.abstract_mode == "deep":
-                if not article["abstract"] or len(article["abstract"]) < 1000:
-                    try:
-                        article["abstract"] = self.fetch_full_abstract(pmid)
-                    except Exception:
-                        pass
-
-            articles.append(article)
+            article = Article(
+                pmid=pmid,
+                title=raw.get("title", "No title"),
+                authors=[name for name in (author.get("name") for author in raw.get("authors", ())) if name],
+                journal=raw.get("source", "No journal"),
+                publicationDate=raw.get("pubdate", "No date"),
+                volume=raw.get("volume", ""),
+                issue=raw.get("issue", ""),
+                pages=raw.get("pages", ""),
+                abstract=raw.get("abstract"),
+                doi=raw.get("elocationid", ""),
+                url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                publicationTypes=raw.get("pubtype", []),
+                meshTerms=raw.get("meshterms", []),
+                keywords=raw.get("keywords", []),
+            )
+            articles[pmid] = article
         return articles
 
+    def _fetch_deep_abstract(self, article: Article) -> None:
+        if not article.abstract or len(article.abstract) < 1000:
+            try:
+                article.abstract = self.fetch_full_abstract(article.pmid)
+            except Exception:
+                pass
+
     def fetch_full_abstract(self, pmid: str) -> str:
         params = self._base_params()
         params.update(
@@ -224,28 +464,35 @@ class PubMedMCPBackend:
         response = self.http.get(f"{PUBMED_BASE_URL}/efetch.fcgi", params=params)
         return response.text
 
-    def _article_cache_path(self, pmid: str) -> Path:
-        return self.config.paper_cache_dir / f"{pmid}.json"
+    def _article_cache_path(self, pmid: str) -> str:
+        return self._paper_cache_prefix + pmid + ".json"
 
-    def _read_article_cache(self, pmid: str) -> Optional[Dict[str, Any]]:
+    def _read_article_cache(self, pmid: str) -> Optional[Article]:
         path = self._article_cache_path(pmid)
         entry = read_json(path)
         if not entry:
             return None
         if _now_ms() - entry.get("timestamp", 0) > self.config.paper_cache_expiry_ms:
             try:
-                path.unlink(missing_ok=True)
+                os.unlink(path)
             except Exception:
                 pass
             return None
-        return entry.get("data")
+        data = entry.get("data")
+        if not data:
+            return None
+        try:
+            return Article(**data)
+        except TypeError:
+            # written by an incompatible cache version; refetch
+            return None
 
-    def _write_article_cache(self, pmid: str, data: Dict[str, Any]) -> None:
+    def _write_article_cache(self, pmid: str, article: Article) -> None:
         entry = {
             "version": self.config.cache_version,
             "pmid": pmid,
             "timestamp": _now_ms(),
-            "data": data,
+            "data": article.to_dict(),
         }
         write_json(self._article_cache_path(pmid), entry)
         self._update_cache_index(pmid, add=True)
@@ -254,19 +501,19 @@ class PubMedMCPBackend:
         index_path = self.config.cache_dir / "index.json"
         index = read_json(index_path) or {
             "version": self.config.cache_version,
-            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "created": _now_iso(),
             "papers": {},
             "stats": {"totalPapers": 0, "lastCleanup": None},
         }
         if add and pmid:
             index["papers"][pmid] = {
-                "cached": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "cached": _now_iso(),
                 "file": f"{pmid}.json",
             }
         elif pmid:
             index["papers"].pop(pmid, None)
         index["stats"]["totalPapers"] = len(index["papers"])
-        index["stats"]["lastCleanup"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        index["stats"]["lastCleanup"] = _now_iso()
         write_json(index_path, index)
 
     # ------------------------------------------------------------------
@@ -274,12 +521,14 @@ class PubMedMCPBackend:
     # ------------------------------------------------------------------
     def cache_stats(self) -> Dict[str, Any]:
         file_index = read_json(self.config.cache_dir / "index.json") or {}
+        memory_stats = self.memory_cache.stats_snapshot()
         return {
             "memory": {
-                "hits": self.memory_cache.stats.hits,
-                "misses": self.memory_cache.stats.misses,
-                "sets": self.memory_cache.stats.sets,
-                "evictions": self.memory_cache.stats.evictions,
+                "hits": memory_stats.hits,
+                "misses": memory_stats.misses,
+                "sets": memory_stats.sets,
+                "evictions": memory_stats.evictions,
+                "hitRate": round(memory_stats.hit_rate, 4),
                 "currentSize": len(self.memory_cache.data),
                 "maxSize": self.memory_cache.max_size,
                 "timeoutMinutes": self.memory_cache.timeout_ms / (60 * 1000),
@@ -308,7 +557,7 @@ class PubMedMCPBackend:
             entry = read_json(path)
             if not entry or _now_ms() - entry.get("timestamp", 0) > self.config.paper_cache_expiry_ms:
                 try:
-                    path.unlink(missing_ok=True)
+                    os.unlink(path)
                 except Exception:
                     pass
                 cleaned += 1
@@ -317,54 +566,75 @@ class PubMedMCPBackend:
 
     def clear_file_cache(self) -> int:
         count = 0
-        if self.config.paper_cache_dir.exists():
-            for entry in self.config.paper_cache_dir.glob("*.json"):
-                try:
-                    entry.unlink()
-                    count += 1
-                except Exception:
-                    pass
+        for path in self._scan_files(self.config.paper_cache_dir, ".json"):
+            try:
+                os.unlink(path)
+                count += 1
+            except Exception:
+                pass
         self._update_cache_index("", add=False)
+        with self._no_pmc_lock:
+            self._no_pmc.clear()
+            self._no_pmc_dirty = True
+        self.flush_no_pmc()
         return count
 
+    @staticmethod
+    def _scan_files(directory: Path, suffix: str) -> List[str]:
+        # DirEntry carries the file type from the directory listing, so this
+        # avoids the extra stat() per entry that Path.glob/exists would issue.
+        try:
+            with os.scandir(directory) as it:
+                return [entry.path for entry in it if entry.name.endswith(suffix) and entry.is_file()]
+        except FileNotFoundError:
+            return []
+
     # ------------------------------------------------------------------
     # Formatting helpers
     # ------------------------------------------------------------------
-    def format_for_llm(self, articles: Sequence[Dict[str, Any]], response_format: str) -> List[Dict[str, Any]]:
+    def format_for_llm(
+        self,
+        articles: Sequence[Article],
+        response_format: str,
+        include_abstract: bool = True,
+    ) -> List[Dict[str, Any]]:
         if response_format == "compact":
-            return [
+            compact = [
                 {
-                    "pmid": a["pmid"],
-                    "title": a["title"],
-                    "authors": self._format_authors(a["authors"], 2),
-                    "journal": a["journal"],
-                    "date": a["publicationDate"],
-                    "url": a["url"],
-                    "abstract": self._truncate(a.get("abstract"), 500),
+                    "pmid": a.pmid,
+                    "title": a.title,
+                    "authors": self._format_authors(a.authors, 2),
+                    "journal": a.journal,
+                    "date": a.publicationDate,
+                    "url": a.url,
                 }
                 for a in articles
             ]
+            if include_abstract:
+                for entry, a in zip(compact, articles):
+                    entry["abstract"] = self._truncate(a.abstract, 500)
+            return compact
 
         if response_format == "detailed":
             formatted: List[Dict[str, Any]] = []
             for article in articles:
                 record = {
-                    "identifier": f"PMID: {article['pmid']}",
-                    "title": article["title"],
-                    "citation": f"{self._format_authors(article['authors'], 3)} {article['journal']}, {article['publicationDate']}",
-                    "url": article["url"],
-                    "volume": article["volume"],
-                    "issue": article["issue"],
-                    "pages": article["pages"],
-                    "doi": article["doi"],
+                    "identifier": f"PMID: {article.pmid}",
+                    "title": article.title,
+                    "citation": f"{self._format_authors(article.authors, 3)} {article.journal}, {article.publicationDate}",
+                    "url": article.url,
+                    "volume": article.volume,
+                    "issue": article.issue,
+                    "pages": article.pages,
+                    "doi": article.doi,
                 }
-                if article.get("abstract"):
-                    abstract = self._truncate(article["abstract"], self.config.abstract_max_chars)
+                if include_abstract and article.abstract:
+                    abstract = self._truncate(article.abstract, self.config.abstract_max_chars)
                     record["abstract"] = abstract
                     record["key_points"] = self._extract_key_points(abstract)
                     record["structured_sections"] = self._extract_structured_sections(abstract)
-                if article.get("meshTerms"):
-                    record["keywords"] = article["meshTerms"][:15]
+                if article.meshTerms:
+                    record["keywords"] = article.meshTerms[:15]
                 formatted.append(record)
             return formatted
 
@@ -372,17 +642,17 @@ class PubMedMCPBackend:
         formatted = []
         for article in articles:
             entry = {
-                "pmid": article["pmid"],
-                "title": article["title"],
-                "citation": f"{self._format_authors(article['authors'], 3)} {article['journal']}, {article['publicationDate']}",
-                "url": article["url"],
+                "pmid": article.pmid,
+                "title": article.title,
+                "citation": f"{self._format_authors(article.authors, 3)} {article.journal}, {article.publicationDate}",
+                "url": article.url,
             }
-            if article.get("abstract"):
-                abstract = self._truncate(article["abstract"], self.config.abstract_max_chars)
+            if include_abstract and article.abstract:
+                abstract = self._truncate(article.abstract, self.config.abstract_max_chars)
                 entry["abstract"] = abstract
                 entry["key_points"] = self._extract_key_points(abstract)
-            if article.get("meshTerms"):
-                entry["keywords"] = article["meshTerms"][:8]
+            if article.meshTerms:
+                entry["keywords"] = article.meshTerms[:8]
             formatted.append(entry)
         return formatted
 
@@ -425,25 +695,28 @@ class PubMedMCPBackend:
     # ------------------------------------------------------------------
     # Open access detection and downloads
     # ------------------------------------------------------------------
-    def detect_open_access(self, article: Dict[str, Any]) -> OpenAccessInfo:
+    def detect_open_access(self, article: Article, save: bool = True) -> OpenAccessInfo:
+        """Pass save=False to defer writing no_pmc.json to a later flush_no_pmc()."""
         sources: List[str] = []
         download_url: Optional[str] = None
         pmcid: Optional[str] = None
 
-        pmcid_info = self._check_pmc(article["pmid"])
+        pmcid_info = self._check_pmc(article.pmid)
+        if save:
+            self.flush_no_pmc()
         if pmcid_info:
             sources.append("PMC")
             download_url = pmcid_info["download_url"]
             pmcid = pmcid_info["pmcid"]
 
-        if not download_url and article.get("doi"):
-            unpaywall = self._check_unpaywall(article["doi"])
+        if not download_url and article.doi:
+            unpaywall = self._check_unpaywall(article.doi)
             if unpaywall:
                 sources.append("Unpaywall")
                 download_url = unpaywall
 
-        if not download_url and article.get("doi"):
-            publisher = self._check_publisher(article["doi"])
+        if not download_url and article.doi:
+            publisher = self._check_publisher(article.doi)
             if publisher:
                 sources.append("Publisher")
                 download_url = publisher
@@ -456,33 +729,58 @@ class PubMedMCPBackend:
         )
 
     def _check_pmc(self, pmid: str) -> Optional[Dict[str, str]]:
+        with self._no_pmc_lock:
+            known_miss = self._no_pmc.get(pmid)
+        if known_miss is not None and _now_ms() - known_miss <= self.config.paper_cache_expiry_ms:
+            return None
         url = f"{PMC_BASE_URL}/?term={pmid}"
         try:
             response = self.http.get(url)
-            html = response.text
         except Exception:
             return None
-        if "PMC" not in html:
-            return None
-        # simplistic extraction
-        marker = "PMC"
-        idx = html.find(marker)
-        if idx == -1:
-            return None
-        digits = []
-        for ch in html[idx + len(marker) : idx + len(marker) + 10]:
-            if ch.isdigit():
-                digits.append(ch)
-            else:
-                break
-        if not digits:
-            return None
-        pmcid = marker + "".join(digits)
+        pmcid = self._extract_pmcid(response)
+        with self._no_pmc_lock:
+            if not pmcid:
+                self._no_pmc[pmid] = _now_ms()
+                self._no_pmc_dirty = True
+                return None
+            if self._no_pmc.pop(pmid, None) is not None:
+                self._no_pmc_dirty = True
         return {
             "pmcid": pmcid,
             "download_url": f"{PMC_BASE_URL}/articles/{pmcid}/pdf/",
         }
 
+    def _no_pmc_path(self) -> Path:
+        return self.config.cache_dir / "no_pmc.json"
+
+    def _load_no_pmc(self) -> Dict[str, int]:
+        data = read_json(self._no_pmc_path()) or {}
+        return dict(data.get("pmids", {}))
+
+    def flush_no_pmc(self) -> None:
+        with self._no_pmc_lock:
+            if not self._no_pmc_dirty:
+                return
+            cutoff = _now_ms() - self.config.paper_cache_expiry_ms
+            self._no_pmc = {pmid: ts for pmid, ts in self._no_pmc.items() if ts >= cutoff}
+            self._no_pmc_dirty = False
+            # written under the lock so an older snapshot never lands last
+            write_json(self._no_pmc_path(), {"version": self.config.cache_version, "pmids": self._no_pmc})
+
+    @staticmethod
+    def _extract_pmcid(response: Any) -> Optional[str]:
+        if HTMLParser is None:
+            match = _PMCID_RE.search(response.text)
+            return match.group(0) if match else None
+        # only trust the article link; PMC ids elsewhere on the page belong
+        # to related articles
+        node = HTMLParser(response.content).css_first('a[href*="/articles/PMC"]')
+        if node is None:
+            return None
+        match = _PMCID_RE.search(node.attributes.get("href") or "")
+        return match.group(0) if match else None
+
     def _check_unpaywall(self, doi: str) -> Optional[str]:
         params = {
             "email": self.config.pubmed_email or "user@example.com",
@@ -524,29 +822,35 @@ class PubMedMCPBackend:
             return {"success": False, "error": "No download URL"}
         headers = {"User-Agent": "Mozilla/5.0 (compatible; PubMedAgent/1.0)"}
         try:
-            response = self.http.get(url, headers=headers)
-            content = response.content
+            response = self.http.get(url, headers=headers, stream=True)
+            with response:
+                # read at most one byte past the limit so oversized files stop early
+                content = response.raw.read(self.config.max_pdf_size_bytes + 1, decode_content=True)
         except Exception as exc:
             return {"success": False, "error": str(exc)}
 
         if len(content) > self.config.max_pdf_size_bytes:
             return {"success": False, "error": "PDF too large"}
 
-        pdf_path = self.config.fulltext_cache_dir / f"{pmid}.pdf"
-        pdf_path.write_bytes(content)
+        pdf_path = self._pdf_path(pmid)
+        with open(pdf_path, "wb") as fp:
+            fp.write(content)
 
         self._update_fulltext_index(
             pmid,
             {
                 "pmid": pmid,
                 "downloadUrl": url,
-                "filePath": pdf_path.name,
+                "filePath": pmid + ".pdf",
                 "fileSize": len(content),
-                "downloaded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "downloaded": _now_iso(),
             },
         )
 
-        return {"success": True, "filePath": str(pdf_path), "fileSize": len(content)}
+        return {"success": True, "filePath": pdf_path, "fileSize": len(content)}
+
+    def _pdf_path(self, pmid: str) -> str:
+        return self._fulltext_cache_prefix + pmid + ".pdf"
 
     def _fulltext_index_path(self) -> Path:
         return self.config.fulltext_cache_dir / "index.json"
@@ -554,7 +858,7 @@ class PubMedMCPBackend:
     def _fulltext_index(self) -> Dict[str, Any]:
         return read_json(self._fulltext_index_path()) or {
             "version": self.config.cache_version,
-            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "created": _now_iso(),
             "fulltext_papers": {},
             "stats": {"totalPDFs": 0, "totalSize": 0, "lastCleanup": None},
         }
@@ -565,7 +869,7 @@ class PubMedMCPBackend:
         index["fulltext_papers"][pmid] = info
         index["stats"]["totalPDFs"] = len(index["fulltext_papers"])
         index["stats"]["totalSize"] = sum(v.get("fileSize", 0) for v in index["fulltext_papers"].values())
-        index["stats"]["lastCleanup"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        index["stats"]["lastCleanup"] = _now_iso()
         write_json(self._fulltext_index_path(), index)
 
     def fulltext_status(self) -> Dict[str, Any]:
@@ -588,17 +892,18 @@ class PubMedMCPBackend:
     def clean_fulltext(self) -> int:
         index = self._fulltext_index()
         papers = index.get("fulltext_papers", {})
+        present = {os.path.basename(path) for path in self._scan_files(self.config.fulltext_cache_dir, ".pdf")}
         cleaned = 0
         for pmid, info in list(papers.items()):
-            pdf_path = self.config.fulltext_cache_dir / info.get("filePath", "")
-            if not pdf_path.exists():
+            file_name = info.get("filePath", "")
+            if file_name not in present:
                 papers.pop(pmid, None)
                 cleaned += 1
                 continue
             age = _now_ms() - int(info.get("timestamp", _now_ms()))
             if age > self.config.fulltext_cache_expiry_ms:
                 try:
-                    pdf_path.unlink()
+                    os.unlink(self._fulltext_cache_prefix + file_name)
                 except Exception:
                     pass
                 papers.pop(pmid, None)
@@ -606,117 +911,118 @@ class PubMedMCPBackend:
         index["fulltext_papers"] = papers
         index["stats"]["totalPDFs"] = len(papers)
         index["stats"]["totalSize"] = sum(item.get("fileSize", 0) for item in papers.values())
-        index["stats"]["lastCleanup"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        index["stats"]["lastCleanup"] = _now_iso()
         write_json(self._fulltext_index_path(), index)
         return cleaned
 
     def clear_fulltext(self) -> int:
         removed = 0
-        if self.config.fulltext_cache_dir.exists():
-            for pdf in self.config.fulltext_cache_dir.glob("*.pdf"):
-                try:
-                    pdf.unlink()
-                    removed += 1
-                except Exception:
-                    pass
+        for path in self._scan_files(self.config.fulltext_cache_dir, ".pdf"):
+            try:
+                os.unlink(path)
+                removed += 1
+            except Exception:
+                pass
         index = self._fulltext_index()
         index["fulltext_papers"] = {}
         index["stats"]["totalPDFs"] = 0
         index["stats"]["totalSize"] = 0
-        index["stats"]["lastCleanup"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        index["stats"]["lastCleanup"] = _now_iso()
         write_json(self._fulltext_index_path(), index)
         return removed
 
     # ------------------------------------------------------------------
     # EndNote export
     # ------------------------------------------------------------------
-    def export_endnote(self, article: Dict[str, Any]) -> Dict[str, Any]:
+    def export_endnote(self, article: Article) -> Dict[str, Any]:
         if not self.config.endnote_export_enabled:
             return {"success": False, "error": "EndNote export disabled"}
 
-        ris_path = self.config.endnote_cache_dir / f"{article['pmid']}.ris"
-        bib_path = self.config.endnote_cache_dir / f"{article['pmid']}.bib"
+        ris_path = self._endnote_cache_prefix + article.pmid + ".ris"
+        bib_path = self._endnote_cache_prefix + article.pmid + ".bib"
 
-        ris_path.write_text(self._generate_ris(article), encoding="utf-8")
-        bib_path.write_text(self._generate_bibtex(article), encoding="utf-8")
+        with open(ris_path, "w", encoding="utf-8") as fp:
+            fp.write(self._generate_ris(article))
+        with open(bib_path, "w", encoding="utf-8") as fp:
+            fp.write(self._generate_bibtex(article))
 
         index_path = self.config.endnote_cache_dir / "index.json"
         index = read_json(index_path) or {
             "version": self.config.cache_version,
-            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "created": _now_iso(),
             "exported_papers": {},
             "stats": {"totalExports": 0, "risFiles": 0, "bibtexFiles": 0, "lastExport": None},
         }
-        index["exported_papers"][article["pmid"]] = {
-            "pmid": article["pmid"],
-            "title": article["title"],
-            "formats": {"ris": str(ris_path), "bibtex": str(bib_path)},
-            "exported": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        index["exported_papers"][article.pmid] = {
+            "pmid": article.pmid,
+            "title": article.title,
+            "formats": {"ris": ris_path, "bibtex": bib_path},
+            "exported": _now_iso(),
         }
         index["stats"]["totalExports"] = len(index["exported_papers"])
         index["stats"]["risFiles"] = len(index["exported_papers"])
         index["stats"]["bibtexFiles"] = len(index["exported_papers"])
-        index["stats"]["lastExport"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        index["stats"]["lastExport"] = _now_iso()
         write_json(index_path, index)
 
         return {
             "success": True,
-            "formats": {"ris": str(ris_path), "bibtex": str(bib_path)},
+            "formats": {"ris": ris_path, "bibtex": bib_path},
         }
 
-    def _generate_ris(self, article: Dict[str, Any]) -> str:
+    def _generate_ris(self, article: Article) -> str:
         lines = ["TY  - JOUR"]
-        if article.get("title"):
-            lines.append(f"TI  - {article['title']}")
-        for author in article.get("authors", []):
+        if article.title:
+            lines.append(f"TI  - {article.title}")
+        for author in article.authors:
             lines.append(f"AU  - {author}")
-        if article.get("journal"):
-            lines.append(f"T2  - {article['journal']}")
-        if article.get("publicationDate"):
-            lines.append(f"PY  - {article['publicationDate']}")
-        if article.get("volume"):
-            lines.append(f"VL  - {article['volume']}")
-        if article.get("issue"):
-            lines.append(f"IS  - {article['issue']}")
-        if article.get("pages"):
-            lines.append(f"SP  - {article['pages']}")
-        if article.get("doi"):
-            lines.append(f"DO  - {article['doi']}")
-        lines.append(f"PMID - {article['pmid']}")
-        if article.get("abstract"):
-            lines.append(f"AB  - {article['abstract']}")
-        for keyword in (article.get("meshTerms") or []):
+        if article.journal:
+            lines.append(f"T2  - {article.journal}")
+        if article.publicationDate:
+            lines.append(f"PY  - {article.publicationDate}")
+        if article.volume:
+            lines.append(f"VL  - {article.volume}")
+        if article.issue:
+            lines.append(f"IS  - {article.issue}")
+        if article.pages:
+            lines.append(f"SP  - {article.pages}")
+        if article.doi:
+            lines.append(f"DO  - {article.doi}")
+        lines.append(f"PMID - {article.pmid}")
+        if article.abstract:
+            lines.append(f"AB  - {article.abstract}")
+        for keyword in (article.meshTerms or []):
             lines.append(f"KW  - {keyword}")
-        lines.append(f"UR  - {article['url']}")
+        lines.append(f"UR  - {article.url}")
         lines.append("LA  - eng")
         lines.append("DB  - PubMed")
         lines.append("ER  - ")
         return "\n".join(lines) + "\n"
 
-    def _generate_bibtex(self, article: Dict[str, Any]) -> str:
-        first_author = article.get("authors", ["unknown"])[0].replace(" ", "").lower()
-        year = article.get("publicationDate", "unknown").split("-")[0]
-        cite_key = f"{first_author}{year}{article['pmid']}"
+    def _generate_bibtex(self, article: Article) -> str:
+        first_author = (article.authors or ["unknown"])[0].replace(" ", "").lower()
+        year = (article.publicationDate or "unknown").split("-")[0]
+        cite_key = f"{first_author}{year}{article.pmid}"
         lines = [f"@article{{{cite_key},"]
-        lines.append(f"  title = {{{article.get('title', 'Unknown Title')}}},")
-        if article.get("authors"):
-            lines.append(f"  author = {{{' and '.join(article['authors'])}}},")
-        if article.get("journal"):
-            lines.append(f"  journal = {{{article['journal']}}},")
-        if article.get("publicationDate"):
-            lines.append(f"  year = {{{article['publicationDate']}}},")
-        if article.get("volume"):
-            lines.append(f"  volume = {{{article['volume']}}},")
-        if article.get("issue"):
-            lines.append(f"  number = {{{article['issue']}}},")
-        if article.get("pages"):
-            lines.append(f"  pages = {{{article['pages']}}},")
-        if article.get("doi"):
-            lines.append(f"  doi = {{{article['doi']}}},")
-        lines.append(f"  pmid = {{{article['pmid']}}},")
-        lines.append(f"  url = {{https://pubmed.ncbi.nlm.nih.gov/{article['pmid']}/}},")
-        if article.get("abstract"):
-            lines.append(f"  abstract = {{{article['abstract']}}},")
+        lines.append(f"  title = {{{article.title or 'Unknown Title'}}},")
+        if article.authors:
+            lines.append(f"  author = {{{' and '.join(article.authors)}}},")
+        if article.journal:
+            lines.append(f"  journal = {{{article.journal}}},")
+        if article.publicationDate:
+            lines.append(f"  year = {{{article.publicationDate}}},")
+        if article.volume:
+            lines.append(f"  volume = {{{article.volume}}},")
+        if article.issue:
+            lines.append(f"  number = {{{article.issue}}},")
+        if article.pages:
+            lines.append(f"  pages = {{{article.pages}}},")
+        if article.doi:
+            lines.append(f"  doi = {{{article.doi}}},")
+        lines.append(f"  pmid = {{{article.pmid}}},")
+        lines.append(f"  url = {{{article.url}}},")
+        if article.abstract:
+            lines.append(f"  abstract = {{{article.abstract}}},")
         lines.append("}")
         return "\n".join(lines) + "\n"
 
@@ -738,24 +1044,12 @@ class PubMedMCPBackend:
         return results
 
     def system_check(self) -> Dict[str, Any]:
-        system_info = {
-            "platform": platform.system().lower(),
-            "arch": platform.machine(),
-            "isWindows": os.name == "nt",
-            "isMacOS": platform.system() == "Darwin",
-            "isLinux": platform.system() == "Linux",
-        }
-
-        tools = []
-        if system_info["isWindows"]:
-            tools.append({"name": "PowerShell", "available": shutil.which("powershell") is not None})
-        else:
-            for tool_name in ("wget", "curl"):
-                tools.append({"name": tool_name, "available": shutil.which(tool_name) is not None})
-
+        global _SYSTEM_CHECK
+        if _SYSTEM_CHECK is None:
+            _SYSTEM_CHECK = _compute_system_check()
         return {
-            "system": system_info,
-            "tools": tools,
-            "recommended": "powershell" if system_info["isWindows"] else ("wget" if shutil.which("wget") else "curl"),
+            "system": dict(_SYSTEM_CHECK["system"]),
+            "tools": [dict(tool) for tool in _SYSTEM_CHECK["tools"]],
+            "recommended": _SYSTEM_CHECK["recommended"],
         }
 
@@ -3,9 +3,26 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple, Union
+
+try:
+    import orjson
+
+    def _dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    # orjson is optional; the stdlib encoder produces the same layout
+
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    _loads = json.loads
 
 
 @dataclass
@@ -16,57 +33,114 @@ class MemoryCacheStats:
     evictions: int = 0
 
 
+class MemoryStatsSnapshot(NamedTuple):
+    """Read-only view of MemoryCacheStats taken under a single lock acquisition."""
+
+    hits: int
+    misses: int
+    sets: int
+    evictions: int
+    hit_rate: float
+
+
 @dataclass
 class MemoryCache:
     timeout_ms: int
     max_size: int
-    data: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # (value, ts) pairs kept in least-recently-used order so eviction is a
+    # popitem from the front
+    data: OrderedDict[str, Tuple[Any, int]] = field(default_factory=OrderedDict)
     stats: MemoryCacheStats = field(default_factory=MemoryCacheStats)
+    # (ts, key) tokens in insertion order; tokens for overwritten or evicted
+    # keys are skipped when their ts no longer matches the stored entry
+    _ttl_queue: Deque[Tuple[int, str]] = field(default_factory=deque, init=False, repr=False, compare=False)
+    # guards data and stats; the HTTP client serves tool calls from several threads
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def get(self, key: str, now_ms: int) -> Optional[Any]:
-        entry = self.data.get(key)
-        if not entry:
-            self.stats.misses += 1
-            return None
-        if now_ms - entry["ts"] > self.timeout_ms:
-            self.data.pop(key, None)
-            self.stats.misses += 1
-            return None
-        self.stats.hits += 1
-        return entry["value"]
+        with self._lock:
+            entry = self.data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, ts = entry
+            if now_ms - ts > self.timeout_ms:
+                del self.data[key]
+                self.stats.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.stats.hits += 1
+            return value
 
     def set(self, key: str, value: Any, now_ms: int) -> None:
-        if len(self.data) >= self.max_size:
-            # remove oldest entry
-            oldest_key = min(self.data.items(), key=lambda item: item[1]["ts"])[0]
-            self.data.pop(oldest_key, None)
-            self.stats.evictions += 1
-        self.data[key] = {"value": value, "ts": now_ms}
-        self.stats.sets += 1
+        with self._lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+            elif len(self.data) >= self.max_size:
+                self.data.popitem(last=False)
+                self.stats.evictions += 1
+            self.data[key] = (value, now_ms)
+            self._ttl_queue.append((now_ms, key))
+            if len(self._ttl_queue) > 2 * self.max_size:
+                self._compact_ttl_queue()
+            self.stats.sets += 1
 
     def clear(self) -> None:
-        self.data.clear()
-        self.stats = MemoryCacheStats()
+        with self._lock:
+            self.data.clear()
+            self._ttl_queue.clear()
+            self.stats = MemoryCacheStats()
 
     def clean_expired(self, now_ms: int) -> int:
-        removed = [key for key, entry in self.data.items() if now_ms - entry["ts"] > self.timeout_ms]
-        for key in removed:
-            self.data.pop(key, None)
-        return len(removed)
+        with self._lock:
+            removed = 0
+            queue = self._ttl_queue
+            while queue and now_ms - queue[0][0] > self.timeout_ms:
+                ts, key = queue.popleft()
+                current = self.data.get(key)
+                if current is not None and current[1] == ts:
+                    del self.data[key]
+                    removed += 1
+            return removed
 
+    def stats_snapshot(self) -> MemoryStatsSnapshot:
+        with self._lock:
+            stats = self.stats
+            lookups = stats.hits + stats.misses
+            hit_rate = stats.hits / lookups if lookups else 0.0
+            return MemoryStatsSnapshot(stats.hits, stats.misses, stats.sets, stats.evictions, hit_rate)
 
-def read_json(path: Path) -> Optional[Dict[str, Any]]:
-    if not path.exists():
-        return None
+    # Expects the caller to hold self._lock.
+    def _compact_ttl_queue(self) -> None:
+        # drop tokens for overwritten or evicted keys so the queue stays
+        # bounded by max_size between clean_expired calls
+        self._ttl_queue = deque(sorted((ts, key) for key, (_, ts) in self.data.items()))
+
+
+def read_json(path: Union[str, os.PathLike]) -> Optional[Dict[str, Any]]:
     try:
-        with path.open("r", encoding="utf-8") as fp:
-            return json.load(fp)
+        with open(path, "rb") as fp:
+            return _loads(fp.read())
     except Exception:
         return None
 
 
-def write_json(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fp:
-        json.dump(data, fp, ensure_ascii=False, indent=2)
+def write_json(path: Union[str, os.PathLike], data: Dict[str, Any]) -> None:
+    path = os.fspath(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = _dumps(data)
+    # write to a per-writer temp file and rename so readers never see a torn file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fp:
+            fp.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import os
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Union
 
-from .backend import PubMedMCPBackend
+from .backend import Article, PubMedMCPBackend
 from .config import PubMedMCPConfig
 from .cache import read_json, write_json
 
@@ -33,14 +34,9 @@ class PubMedMCPClient:
         response_format: str = "standard",
     ) -> Dict[str, Any]:
         effective_max = min(max_results, page_size)
-        result = self.backend.search_pubmed(query, effective_max, days_back, sort_by)
+        result = self.backend.search_pubmed(query, effective_max, days_back, sort_by, include_abstract)
 
-        formatted = self.backend.format_for_llm(result["articles"], response_format)
-
-        if include_abstract is False:
-            for item in formatted:
-                item.pop("abstract", None)
-                item.pop("key_points", None)
+        formatted = self.backend.format_for_llm(result["articles"], response_format, include_abstract)
 
         endnote_export = None
         if self.config.endnote_export_enabled and result["articles"]:
@@ -48,7 +44,7 @@ class PubMedMCPClient:
             for article in result["articles"]:
                 export_result = self.backend.export_endnote(article)
                 if export_result.get("success"):
-                    endnote_export.append({"pmid": article["pmid"], **export_result})
+                    endnote_export.append({"pmid": article.pmid, **export_result})
 
         return {
             "success": True,
@@ -108,7 +104,7 @@ class PubMedMCPClient:
         pmid_list = [pmids] if isinstance(pmids, str) else list(pmids)
         if len(pmid_list) > 20:
             raise ValueError("A maximum of 20 PMIDs can be requested")
-        articles = self.backend.fetch_article_details(pmid_list)
+        articles = [article.to_dict() for article in self.backend.fetch_article_details(pmid_list)]
         if include_full_text:
             for article in articles:
                 try:
@@ -150,11 +146,12 @@ class PubMedMCPClient:
                 "publicationTypes": article.get("publicationTypes", []),
             }
         if "authors" in extract_sections:
+            authors = article.get("authors") or []
             info["authors"] = {
-                "full_list": article.get("authors", []),
-                "first_author": article.get("authors", [None])[0],
-                "last_author": article.get("authors", [None])[-1],
-                "author_count": len(article.get("authors", [])),
+                "full_list": authors,
+                "first_author": authors[0] if authors else None,
+                "last_author": authors[-1] if authors else None,
+                "author_count": len(authors),
             }
         if "abstract_summary" in extract_sections and article.get("abstract"):
             truncated = self.backend._truncate(article["abstract"], max_abstract_length or self.config.abstract_max_chars)
@@ -193,13 +190,16 @@ class PubMedMCPClient:
             query = f"{pmid}[uid] AND review[publication type]"
         else:
             query = f"{pmid}[uid]"
-        result = self.search(query, max_results=max_results)
+        # ids first, then one detail fetch; skips EndNote export and search metadata
+        ids = self.backend.search_ids_only(query, min(max_results, 20))["ids"]
+        articles = self.backend.fetch_article_details(ids) if ids else []
+        related = self.backend.format_for_llm(articles, "standard")
         return {
             "success": True,
             "base_pmid": pmid,
             "reference_type": reference_type,
-            "related_articles": result["articles"],
-            "metadata": {"found": len(result["articles"]), "max_results": max_results},
+            "related_articles": related,
+            "metadata": {"found": len(related), "max_results": max_results},
         }
 
     def batch_query(
@@ -223,7 +223,7 @@ class PubMedMCPClient:
     # Full-text handling
     # ------------------------------------------------------------------
     def detect_fulltext(self, pmid: str, *, auto_download: bool = False) -> Dict[str, Any]:
-        article = self.get_details([pmid])["articles"][0]
+        article = self._get_article(pmid)
         oa_info = self.backend.detect_open_access(article)
         download_result = None
         if oa_info.is_open_access and (auto_download or self.config.fulltext_auto_download):
@@ -236,12 +236,12 @@ class PubMedMCPClient:
             "success": True,
             "pmid": pmid,
             "article_info": {
-                "title": article["title"],
-                "authors": article.get("authors", [])[:3],
-                "journal": article["journal"],
-                "doi": article["doi"],
+                "title": article.title,
+                "authors": article.authors[:3],
+                "journal": article.journal,
+                "doi": article.doi,
             },
-            "open_access": oa_info.__dict__,
+            "open_access": oa_info.to_dict(),
             "download_result": download_result,
             "fulltext_mode": {
                 "enabled": self.config.fulltext_enabled,
@@ -256,7 +256,7 @@ class PubMedMCPClient:
         cached = None if force_download else self._is_pdf_cached(pmid)
         if cached:
             return {"success": True, "status": "already_cached", **cached}
-        article = self.get_details([pmid])["articles"][0]
+        article = self._get_article(pmid)
         oa_info = self.backend.detect_open_access(article)
         if not oa_info.is_open_access:
             return {"success": False, "error": "No open access full-text available", "open_access_sources": oa_info.sources}
@@ -265,7 +265,7 @@ class PubMedMCPClient:
             "success": download_result.get("success", False),
             "pmid": pmid,
             "download_result": download_result,
-            "open_access_info": oa_info.__dict__,
+            "open_access_info": oa_info.to_dict(),
         }
 
     def fulltext_status(self, *, action: str = "stats", pmid: Optional[str] = None) -> Dict[str, Any]:
@@ -285,12 +285,18 @@ class PubMedMCPClient:
     def batch_download(self, pmids: Sequence[str]) -> Dict[str, Any]:
         if not self.config.fulltext_enabled:
             return {"success": False, "error": "Full-text mode disabled"}
+        articles = {article.pmid: article for article in self.backend.fetch_article_details(list(pmids))}
         download_list = []
-        for pmid in pmids:
-            article = self.get_details([pmid])["articles"][0]
-            oa_info = self.backend.detect_open_access(article)
-            if oa_info.is_open_access:
-                download_list.append({"pmid": pmid, "download_url": oa_info.download_url})
+        try:
+            for pmid in pmids:
+                article = articles.get(pmid)
+                if article is None:
+                    continue
+                oa_info = self.backend.detect_open_access(article, save=False)
+                if oa_info.is_open_access:
+                    download_list.append({"pmid": pmid, "download_url": oa_info.download_url})
+        finally:
+            self.backend.flush_no_pmc()
         results = self.backend.batch_download(download_list)
         return {
             "success": True,
@@ -345,19 +351,26 @@ class PubMedMCPClient:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _get_article(self, pmid: str) -> Article:
+        return self.backend.fetch_article_details([pmid])[0]
+
     def _is_pdf_cached(self, pmid: str) -> Optional[Dict[str, Any]]:
-        pdf_path = self.backend.config.fulltext_cache_dir / f"{pmid}.pdf"
-        if not pdf_path.exists():
+        pdf_path = self.backend._pdf_path(pmid)
+        try:
+            stats = os.stat(pdf_path)
+        except FileNotFoundError:
             return None
-        stats = pdf_path.stat()
-        age_hours = (time.time() - stats.st_mtime) / 3600
-        if age_hours * 3600 * 1000 > self.config.fulltext_cache_expiry_ms:
+        age_seconds = time.time() - stats.st_mtime
+        if age_seconds * 1000 > self.config.fulltext_cache_expiry_ms:
             return None
-        return {"file_path": str(pdf_path), "file_size": stats.st_size, "age_hours": round(age_hours, 2)}
+        return {"file_path": pdf_path, "file_size": stats.st_size, "age_hours": round(age_seconds / 3600, 2)}
 
     def _is_file_older_than(self, path: Path, *, days: int) -> bool:
-        age_days = (time.time() - path.stat().st_mtime) / (24 * 3600)
-        return age_days > days
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return False
+        return time.time() - mtime > days * 24 * 3600
 
 
 
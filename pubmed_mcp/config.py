@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+_TRUTHY = frozenset({"1", "true", "yes", "enabled", "on"})
+_ABSTRACT_MODES = frozenset({"quick", "deep"})
+_FULLTEXT_ON_MODES = frozenset({"enabled", "auto"})
+
 
 @dataclass(frozen=True)
 class PubMedMCPConfig:
@@ -28,6 +33,7 @@ class PubMedMCPConfig:
     # Rate limiting / timeout
     rate_limit_delay_ms: int
     request_timeout_ms: int
+    esummary_batch_window_ms: int
 
     # Cache paths
     cache_dir: Path
@@ -54,54 +60,64 @@ class PubMedMCPConfig:
 
     @classmethod
     def from_env(cls, base_path: Optional[Path] = None) -> "PubMedMCPConfig":
-        """Read configuration from environment variables."""
+        """Read configuration from environment variables.
+
+        Results are cached per base directory, since the environment is not
+        expected to change while the process runs.
+        """
+
+        return cls._from_env_cached(Path(base_path or os.getcwd()))
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def _from_env_cached(cls, base_dir: Path) -> "PubMedMCPConfig":
+        env = os.environ
 
         def _bool_env(name: str, default: str = "false") -> bool:
-            value = os.getenv(name, default)
-            return value.lower() in {"1", "true", "yes", "enabled", "on"}
+            return env.get(name, default).lower() in _TRUTHY
 
-        base_dir = Path(base_path or os.getcwd())
-        cache_dir = Path(os.getenv("PUBMED_MCP_CACHE_DIR", base_dir / "cache"))
+        cache_dir = Path(env.get("PUBMED_MCP_CACHE_DIR", base_dir / "cache"))
 
-        abstract_mode = os.getenv("ABSTRACT_MODE", "quick").lower()
-        if abstract_mode not in {"quick", "deep"}:
+        abstract_mode = env.get("ABSTRACT_MODE", "quick").lower()
+        if abstract_mode not in _ABSTRACT_MODES:
             abstract_mode = "quick"
 
-        fulltext_mode = os.getenv("FULLTEXT_MODE", "disabled").lower()
-        fulltext_enabled = fulltext_mode in {"enabled", "auto"}
+        fulltext_mode = env.get("FULLTEXT_MODE", "disabled").lower()
+        fulltext_enabled = fulltext_mode in _FULLTEXT_ON_MODES
         fulltext_auto_download = fulltext_mode == "auto"
 
         endnote_export_enabled = _bool_env("ENDNOTE_EXPORT", "enabled")
 
         return cls(
-            pubmed_api_key=os.getenv("PUBMED_API_KEY"),
-            pubmed_email=os.getenv("PUBMED_EMAIL"),
-            pubmed_tool_name=os.getenv("PUBMED_TOOL_NAME", "pubmed_agent"),
+            pubmed_api_key=env.get("PUBMED_API_KEY"),
+            pubmed_email=env.get("PUBMED_EMAIL"),
+            pubmed_tool_name=env.get("PUBMED_TOOL_NAME", "pubmed_agent"),
             abstract_mode=abstract_mode,
             abstract_max_chars=6000 if abstract_mode == "deep" else 1500,
             fulltext_mode=fulltext_mode,
             fulltext_enabled=fulltext_enabled,
             fulltext_auto_download=fulltext_auto_download,
             endnote_export_enabled=endnote_export_enabled,
-            rate_limit_delay_ms=int(os.getenv("PUBMED_RATE_LIMIT_DELAY_MS", "334")),
-            request_timeout_ms=int(os.getenv("PUBMED_REQUEST_TIMEOUT_MS", "30000")),
+            rate_limit_delay_ms=int(env.get("PUBMED_RATE_LIMIT_DELAY_MS", "334")),
+            request_timeout_ms=int(env.get("PUBMED_REQUEST_TIMEOUT_MS", "30000")),
+            esummary_batch_window_ms=int(env.get("PUBMED_ESUMMARY_BATCH_WINDOW_MS", "20")),
             cache_dir=cache_dir,
             paper_cache_dir=cache_dir / "papers",
             fulltext_cache_dir=cache_dir / "fulltext",
             endnote_cache_dir=cache_dir / "endnote",
-            cache_version=os.getenv("PUBMED_CACHE_VERSION", "1.0"),
-            paper_cache_expiry_ms=int(os.getenv("PUBMED_PAPER_CACHE_EXPIRY_MS", str(30 * 24 * 60 * 60 * 1000))),
-            fulltext_cache_expiry_ms=int(os.getenv("PUBMED_FULLTEXT_CACHE_EXPIRY_MS", str(90 * 24 * 60 * 60 * 1000))),
-            max_pdf_size_bytes=int(os.getenv("PUBMED_MAX_PDF_SIZE_BYTES", str(50 * 1024 * 1024))),
-            cache_timeout_ms=int(os.getenv("PUBMED_MEMORY_CACHE_TIMEOUT_MS", str(5 * 60 * 1000))),
-            cache_max_size=int(os.getenv("PUBMED_MEMORY_CACHE_MAX_SIZE", "100")),
+            cache_version=env.get("PUBMED_CACHE_VERSION", "1.0"),
+            paper_cache_expiry_ms=int(env.get("PUBMED_PAPER_CACHE_EXPIRY_MS", str(30 * 24 * 60 * 60 * 1000))),
+            fulltext_cache_expiry_ms=int(env.get("PUBMED_FULLTEXT_CACHE_EXPIRY_MS", str(90 * 24 * 60 * 60 * 1000))),
+            max_pdf_size_bytes=int(env.get("PUBMED_MAX_PDF_SIZE_BYTES", str(50 * 1024 * 1024))),
+            cache_timeout_ms=int(env.get("PUBMED_MEMORY_CACHE_TIMEOUT_MS", str(5 * 60 * 1000))),
+            cache_max_size=int(env.get("PUBMED_MEMORY_CACHE_MAX_SIZE", "100")),
             proxy_enabled=_bool_env("PROXY_ENABLED", "disabled"),
-            http_proxy=os.getenv("HTTP_PROXY") or os.getenv("http_proxy"),
-            https_proxy=os.getenv("HTTPS_PROXY") or os.getenv("https_proxy"),
-            proxy_username=os.getenv("PROXY_USERNAME"),
-            proxy_password=os.getenv("PROXY_PASSWORD"),
-            proxy_timeout=int(os.getenv("PROXY_TIMEOUT", "30")),
-            proxy_retry_count=int(os.getenv("PROXY_RETRY_COUNT", "3")),
+            http_proxy=env.get("HTTP_PROXY") or env.get("http_proxy"),
+            https_proxy=env.get("HTTPS_PROXY") or env.get("https_proxy"),
+            proxy_username=env.get("PROXY_USERNAME"),
+            proxy_password=env.get("PROXY_PASSWORD"),
+            proxy_timeout=int(env.get("PROXY_TIMEOUT", "30")),
+            proxy_retry_count=int(env.get("PROXY_RETRY_COUNT", "3")),
         )
 
 
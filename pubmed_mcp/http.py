@@ -4,40 +4,79 @@ from __future__ import annotations
 
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 
-@dataclass
-class ProxyConfig:
-    enabled: bool
-    http_proxy: Optional[str]
-    https_proxy: Optional[str]
-    username: Optional[str]
-    password: Optional[str]
+def _inject_credentials(url: str, username: Optional[str], password: Optional[str]) -> str:
+    if username and password and "@" not in url.split("//", 1)[-1]:
+        scheme, remainder = url.split("//", 1)
+        return f"{scheme}//{username}:{password}@{remainder}"
+    return url
+
+
+class ProxyConfig(NamedTuple):
+    """Proxy URLs with credentials already injected; None when unused."""
+
+    http_proxy_final: Optional[str]
+    https_proxy_final: Optional[str]
+
+    @classmethod
+    def build(
+        cls,
+        enabled: bool,
+        http_proxy: Optional[str],
+        https_proxy: Optional[str],
+        username: Optional[str],
+        password: Optional[str],
+    ) -> "ProxyConfig":
+        if not enabled:
+            return cls(None, None)
+        return cls(
+            _inject_credentials(http_proxy, username, password) if http_proxy else None,
+            _inject_credentials(https_proxy, username, password) if https_proxy else None,
+        )
 
     def as_requests_proxies(self) -> Optional[Dict[str, str]]:
-        if not self.enabled:
-            return None
-
-        proxies: Dict[str, str] = {}
-        if self.http_proxy:
-            proxies["http"] = self._inject_credentials(self.http_proxy)
-        if self.https_proxy:
-            proxies["https"] = self._inject_credentials(self.https_proxy)
-        if not proxies:
-            return None
-        return proxies
-
-    def _inject_credentials(self, url: str) -> str:
-        if self.username and self.password and "@" not in url.split("//", 1)[-1]:
-            scheme, remainder = url.split("//", 1)
-            return f"{scheme}//{self.username}:{self.password}@{remainder}"
-        return url
+        proxies = {
+            scheme: url
+            for scheme, url in (("http", self.http_proxy_final), ("https", self.https_proxy_final))
+            if url
+        }
+        return proxies or None
+
+
+@lru_cache(maxsize=4)
+def _build_session(
+    proxy_key: Optional[Tuple[Tuple[str, str], ...]],
+    retry_count: int,
+    proxy_timeout: int,
+    user_agent: str,
+) -> requests.Session:
+    """Return a pooled session shared by clients with the same proxy settings."""
+
+    session = requests.Session()
+
+    retry = Retry(
+        total=retry_count,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=20, pool_block=True, pool_connections=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.trust_env = False
+    session.timeout = proxy_timeout
+    if proxy_key:
+        session.proxies.update(proxy_key)
+    session.headers.update({"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate"})
+    return session
 
 
 class PubMedHTTPClient:
@@ -50,47 +89,55 @@ class PubMedHTTPClient:
         rate_limit_delay_ms: int,
         proxy_timeout: int,
         proxy_retry_count: int,
+        tool_name: str = "pubmed_agent",
+        email: Optional[str] = None,
     ) -> None:
         self._rate_limit_delay = rate_limit_delay_ms / 1000.0
         self._timeout = request_timeout_ms / 1000.0
-        self._last_request_ts = 0.0
+        self._next_slot = 0.0
         self._lock = threading.Lock()
 
-        self._session = requests.Session()
-
-        retry = Retry(
-            total=proxy_retry_count,
-            backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"],
+        proxies = proxy_config.as_requests_proxies()
+        self._session = _build_session(
+            tuple(sorted(proxies.items())) if proxies else None,
+            proxy_retry_count,
+            proxy_timeout,
+            f"{tool_name} (mailto:{email or 'unknown'})",
         )
-        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=20, pool_block=True, pool_connections=20)
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
-
-        self._session.trust_env = False
-        self._session.timeout = proxy_timeout
-
-        self._proxies = proxy_config.as_requests_proxies()
 
     def _enforce_rate_limit(self) -> None:
+        # Reserve the next send slot under the lock, then sleep without it so
+        # concurrent callers wait out their own slots in parallel.
         with self._lock:
             now = time.monotonic()
-            elapsed = now - self._last_request_ts
-            if elapsed < self._rate_limit_delay:
-                time.sleep(self._rate_limit_delay - elapsed)
-            self._last_request_ts = time.monotonic()
+            target = max(now, self._next_slot)
+            self._next_slot = target + self._rate_limit_delay
+        wait = target - now
+        if wait > 0:
+            time.sleep(wait)
 
-    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
         self._enforce_rate_limit()
         response = self._session.get(
             url,
             params=params,
             headers=headers,
             timeout=self._timeout,
-            proxies=self._proxies,
+            stream=stream,
         )
-        response.raise_for_status()
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            # an unread streamed body keeps its pooled connection checked out
+            if stream:
+                response.close()
+            raise
         return response
 
     def post(
@@ -107,7 +154,6 @@ class PubMedHTTPClient:
             json=json,
             headers=headers,
             timeout=self._timeout,
-            proxies=self._proxies,
         )
         response.raise_for_status()
         return response
@@ -19,81 +19,146 @@ Supports single query and multi-turn conversation
 import os
 import sys
 import argparse
-from typing import Optional
+import threading
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
+# 缓存 API Key，避免每次检查都查询环境变量
+_LLM_API_KEY = os.environ.get("LLM_API_KEY") or os.environ.get("OPENAI_API_KEY")
+
+# 导入代理（失败时在查询时报告错误）
+try:
+    from pubmed_agent import PubMedAgent
+    _import_err: Optional[ImportError] = None
+except ImportError as _e:
+    PubMedAgent = None
+    _import_err = _e
+
+# 按语言缓存的代理实例，供多次 single_query 调用复用
+_agent_cache: Dict[str, "PubMedAgent"] = {}
+_agent_cache_lock = threading.Lock()
+
+def _get_agent(language: str) -> "PubMedAgent":
+    """获取（或创建并缓存）指定语言的代理，复用时开启新会话并清除上一次查询的对话历史"""
+    with _agent_cache_lock:
+        agent = _agent_cache.get(language)
+        if agent is None:
+            agent = _agent_cache[language] = PubMedAgent(language=language)
+        else:
+            # 新的 thread_id 同时隔离对话记忆与向量库集合
+            agent.clear_memory()
+            agent.start_new_session()
+        return agent
+
+# 输出分隔线与横幅（预先构建）
+_EQ70 = "=" * 70
+_DASH70 = "-" * 70
+_BANNER = "\n".join([
+    _EQ70,
+    "🧬 ReAct PubMed Agent - 命令行查询工具",
+    "   Command-line Query Tool for Scientific Literature",
+    _EQ70,
+    "",
+])
+
+# 对话模式中的特殊命令
+_EXIT_CMDS = frozenset({'exit', 'quit', '退出'})
+_CLEAR_CMDS = frozenset({'clear', '清除'})
+_STATS_CMDS = frozenset({'stats', '统计'})
+
+# 对话循环中使用的固定提示文本
+_PROMPT_PREFIX = "] 您的问题 / Your question: "
+_MSG_GOODBYE = "\n👋 再见！/ Goodbye!"
+_MSG_CLEARED = "✅ 对话历史已清除 / Conversation history cleared\n"
+_MSG_STATS_HEADER = "\n📊 代理统计信息 / Agent Statistics:\n" + _DASH70
+_MSG_PROCESSING = "\n🔍 正在处理... / Processing..."
+
 def print_banner():
     """打印欢迎横幅"""
-    print("=" * 70)
-    print("🧬 ReAct PubMed Agent - 命令行查询工具")
-    print("   Command-line Query Tool for Scientific Literature")
-    print("=" * 70)
-    print()
+    print(_BANNER)
+
+_ENV_ERROR_MSG = """❌ 错误: LLM_API_KEY 或 OPENAI_API_KEY 环境变量未设置
+   Error: LLM_API_KEY or OPENAI_API_KEY environment variable not set
+
+请执行以下步骤:
+Please follow these steps:
+1. 复制 .env.example 为 .env: copy .env.example .env (Windows) 或 cp .env.example .env (Linux/macOS)
+   Copy .env.example to .env: copy .env.example .env (Windows) or cp .env.example .env (Linux/macOS)
+2. 编辑 .env 文件，填入您的 LLM_API_KEY 或 OPENAI_API_KEY
+   Edit .env file and fill in your LLM_API_KEY or OPENAI_API_KEY
+3. 支持多种大模型供应商：OpenAI、Azure OpenAI、本地模型等
+   Supports multiple providers: OpenAI, Azure OpenAI, local models, etc.
+4. 重新运行此脚本
+   Run this script again
+"""
+
+# 环境检查结果（成功后缓存）
+_env_checked: Optional[bool] = None
 
 def check_environment():
     """检查环境配置"""
+    global _env_checked
+    if _env_checked:
+        return True
     # 检查 LLM API Key（支持多种供应商）
-    llm_api_key = os.getenv("LLM_API_KEY") or os.getenv("OPENAI_API_KEY")
-    if not llm_api_key:
-        print("❌ 错误: LLM_API_KEY 或 OPENAI_API_KEY 环境变量未设置")
-        print("   Error: LLM_API_KEY or OPENAI_API_KEY environment variable not set")
-        print()
-        print("请执行以下步骤:")
-        print("Please follow these steps:")
-        print("1. 复制 .env.example 为 .env: copy .env.example .env (Windows) 或 cp .env.example .env (Linux/macOS)")
-        print("   Copy .env.example to .env: copy .env.example .env (Windows) or cp .env.example .env (Linux/macOS)")
-        print("2. 编辑 .env 文件，填入您的 LLM_API_KEY 或 OPENAI_API_KEY")
-        print("   Edit .env file and fill in your LLM_API_KEY or OPENAI_API_KEY")
-        print("3. 支持多种大模型供应商：OpenAI、Azure OpenAI、本地模型等")
-        print("   Supports multiple providers: OpenAI, Azure OpenAI, local models, etc.")
-        print("4. 重新运行此脚本")
-        print("   Run this script again")
+    if not _LLM_API_KEY:
+        sys.stdout.write(_ENV_ERROR_MSG)
         return False
+    _env_checked = True
     return True
 
+def _preview(text: str, n: int = 200) -> str:
+    """截断过长文本用于预览，短文本原样返回"""
+    return text if len(text) <= n else text[:n] + "..."
+
 def format_response(response: dict, verbose: bool = False):
     """格式化并打印响应，并自动保存为Markdown文档"""
-    print("\n" + "=" * 70)
-    print("📋 查询结果 / Query Results")
-    print("=" * 70)
+    parts = ["\n", _EQ70, "\n📋 查询结果 / Query Results\n", _EQ70, "\n"]
     
     if response.get('success'):
-        print(f"\n✅ 状态: 成功 / Status: Success")
-        print(f"🌐 语言: {response.get('language', 'unknown')} / Language: {response.get('language', 'unknown')}")
-        print(f"📝 提示词类型: {response.get('prompt_type', 'unknown')} / Prompt Type: {response.get('prompt_type', 'unknown')}")
+        lang = response.get('language', 'unknown')
+        ptype = response.get('prompt_type', 'unknown')
+        steps = response.get('intermediate_steps') or ()
+        answer = response.get('answer', 'No answer provided')
+        
+        parts.append(
+            f"\n✅ 状态: 成功 / Status: Success\n"
+            f"🌐 语言: {lang} / Language: {lang}\n"
+            f"📝 提示词类型: {ptype} / Prompt Type: {ptype}\n"
+        )
         
         if verbose:
-            print(f"\n📊 推理步骤数: {len(response.get('intermediate_steps', []))} / Reasoning Steps: {len(response.get('intermediate_steps', []))}")
+            n_steps = len(steps)
+            parts.append(f"\n📊 推理步骤数: {n_steps} / Reasoning Steps: {n_steps}\n")
         
-        print("\n" + "-" * 70)
-        print("💬 回答 / Answer:")
-        print("-" * 70)
-        print(response.get('answer', 'No answer provided'))
-        print()
+        parts += ["\n", _DASH70, "\n💬 回答 / Answer:\n", _DASH70, "\n", str(answer), "\n\n"]
         
-        if verbose and response.get('intermediate_steps'):
-            print("-" * 70)
-            print("🔍 推理过程 / Reasoning Process (详细)")
-            print("-" * 70)
-            for i, step in enumerate(response.get('intermediate_steps', []), 1):
-                print(f"\n步骤 {i} / Step {i}:")
+        if verbose and steps:
+            parts += [_DASH70, "\n🔍 推理过程 / Reasoning Process (详细)\n", _DASH70, "\n"]
+            for i, step in enumerate(steps, 1):
+                parts.append(f"\n步骤 {i} / Step {i}:\n")
                 if isinstance(step, tuple) and len(step) >= 2:
-                    action, observation = step[0], step[1]
+                    action, obs = step[0], step[1]
                     if hasattr(action, 'tool'):
-                        print(f"  工具 / Tool: {action.tool}")
+                        parts.append(f"  工具 / Tool: {action.tool}\n")
                     if hasattr(action, 'tool_input'):
-                        print(f"  输入 / Input: {action.tool_input}")
-                    print(f"  观察 / Observation: {str(observation)[:200]}...")
+                        parts.append(f"  输入 / Input: {action.tool_input}\n")
+                    # 字符串观察直接截断，避免重复转换
+                    obs_preview = _preview(obs if isinstance(obs, str) else str(obs))
+                    parts.append(f"  观察 / Observation: {obs_preview}\n")
     else:
-        print(f"\n❌ 状态: 失败 / Status: Failed")
-        print(f"错误信息 / Error: {response.get('error', 'Unknown error')}")
-        print()
+        parts.append(
+            f"\n❌ 状态: 失败 / Status: Failed\n"
+            f"错误信息 / Error: {response.get('error', 'Unknown error')}\n\n"
+        )
     
-    print("=" * 70)
-    print()
+    # 整个结果一次性写出
+    parts += [_EQ70, "\n\n"]
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
     
     # 自动保存为Markdown文档
     try:
@@ -105,42 +170,50 @@ def format_response(response: dict, verbose: bool = False):
         print(f"⚠️  保存Markdown文档时出错 / Error saving Markdown: {e}")
         print()
 
+def print_import_error():
+    """打印导入错误提示"""
+    print(f"❌ 导入错误 / Import Error: {_import_err}")
+    print("请确保已安装依赖: pip install -r requirements.txt")
+    print("Please make sure dependencies are installed: pip install -r requirements.txt")
+
 def single_query(question: str, language: str = "auto", verbose: bool = False):
     """执行单次查询"""
+    if not check_environment():
+        return None
+    if PubMedAgent is None:
+        print_import_error()
+        return None
     try:
-        from pubmed_agent import PubMedAgent
-        
         print(f"🔍 正在处理查询... / Processing query...")
         print(f"问题 / Question: {question}")
         print()
         
-        agent = PubMedAgent(language=language)
+        agent = _get_agent(language)
         response = agent.query(question)
         
         format_response(response, verbose)
         
         return response
         
-    except ImportError as e:
-        print(f"❌ 导入错误 / Import Error: {e}")
-        print("请确保已安装依赖: pip install -r requirements.txt")
-        print("Please make sure dependencies are installed: pip install -r requirements.txt")
-        return None
     except Exception as e:
         print(f"❌ 错误 / Error: {e}")
         return None
 
 def conversation_mode(language: str = "auto", verbose: bool = False):
     """多轮对话模式"""
+    if not check_environment():
+        return
+    if PubMedAgent is None:
+        print_import_error()
+        return
     try:
-        from pubmed_agent import PubMedAgent
-        
-        print("💬 进入多轮对话模式 / Entering multi-turn conversation mode")
-        print("输入 'exit' 或 'quit' 退出 / Type 'exit' or 'quit' to exit")
-        print("输入 'clear' 清除对话历史 / Type 'clear' to clear conversation history")
-        print("输入 'stats' 查看代理统计 / Type 'stats' to view agent statistics")
-        print("-" * 70)
-        print()
+        sys.stdout.write(
+            "💬 进入多轮对话模式 / Entering multi-turn conversation mode\n"
+            "输入 'exit' 或 'quit' 退出 / Type 'exit' or 'quit' to exit\n"
+            "输入 'clear' 清除对话历史 / Type 'clear' to clear conversation history\n"
+            "输入 'stats' 查看代理统计 / Type 'stats' to view agent statistics\n"
+            + _DASH70 + "\n\n"
+        )
         
         agent = PubMedAgent(language=language)
         conversation_count = 0
@@ -148,34 +221,33 @@ def conversation_mode(language: str = "auto", verbose: bool = False):
         while True:
             try:
                 # 获取用户输入
-                question = input(f"[{conversation_count + 1}] 您的问题 / Your question: ").strip()
+                question = input("[" + str(conversation_count + 1) + _PROMPT_PREFIX).strip()
                 
                 if not question:
                     continue
                 
                 # 处理特殊命令
-                if question.lower() in ['exit', 'quit', '退出']:
-                    print("\n👋 再见！/ Goodbye!")
+                q_lower = question.lower()
+                if q_lower in _EXIT_CMDS:
+                    print(_MSG_GOODBYE)
                     break
                 
-                if question.lower() in ['clear', '清除']:
+                if q_lower in _CLEAR_CMDS:
                     agent.clear_memory()
                     conversation_count = 0
-                    print("✅ 对话历史已清除 / Conversation history cleared")
-                    print()
+                    print(_MSG_CLEARED)
                     continue
                 
-                if question.lower() in ['stats', '统计']:
+                if q_lower in _STATS_CMDS:
                     stats = agent.get_agent_stats()
-                    print("\n📊 代理统计信息 / Agent Statistics:")
-                    print("-" * 70)
+                    print(_MSG_STATS_HEADER)
                     for key, value in stats.items():
                         print(f"  {key}: {value}")
                     print()
                     continue
                 
                 # 执行查询
-                print(f"\n🔍 正在处理... / Processing...")
+                print(_MSG_PROCESSING)
                 response = agent.query(question)
                 
                 format_response(response, verbose)
@@ -183,19 +255,15 @@ def conversation_mode(language: str = "auto", verbose: bool = False):
                 conversation_count += 1
                 
             except KeyboardInterrupt:
-                print("\n\n👋 再见！/ Goodbye!")
+                print("\n" + _MSG_GOODBYE)
                 break
             except EOFError:
-                print("\n\n👋 再见！/ Goodbye!")
+                print("\n" + _MSG_GOODBYE)
                 break
             except Exception as e:
                 print(f"\n❌ 错误 / Error: {e}")
                 print()
         
-    except ImportError as e:
-        print(f"❌ 导入错误 / Import Error: {e}")
-        print("请确保已安装依赖: pip install -r requirements.txt")
-        print("Please make sure dependencies are installed: pip install -r requirements.txt")
     except Exception as e:
         print(f"❌ 错误 / Error: {e}")
 
@@ -203,30 +271,23 @@ def parse_colon_args():
     """解析 -key:value 格式的参数"""
     # 预处理 sys.argv，将 -key:value 格式转换为 -key value 格式
     processed_args = []
-    i = 0
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg.startswith('-') and ':' in arg and not arg.startswith('--'):
+    for arg in sys.argv:
+        idx = arg.find(':')
+        if idx > 0 and arg[0] == '-' and not arg.startswith('--'):
             # 处理 -key:value 格式
-            key, value = arg.split(':', 1)
-            processed_args.append(key)
-            processed_args.append(value)
+            processed_args.append(arg[:idx])
+            processed_args.append(arg[idx + 1:])
         else:
             processed_args.append(arg)
-        i += 1
     return processed_args
 
-def main():
-    """主函数"""
-    # 预处理参数，支持 -key:value 格式
-    original_argv = sys.argv[:]
-    try:
-        sys.argv = parse_colon_args()
-        
-        parser = argparse.ArgumentParser(
-            description='PubMed Agent 命令行查询工具 / Command-line Query Tool',
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog="""
+def _build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        description='PubMed Agent 命令行查询工具 / Command-line Query Tool',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        allow_abbrev=False,
+        epilog="""
 使用示例 / Usage Examples:
   python query.py -question:"What are the mechanisms of mRNA vaccines?"
   python query.py -question:"mRNA疫苗的作用机制是什么？"
@@ -239,48 +300,61 @@ def main():
   -language: 语言设置 (en/zh/auto) / Language setting (en/zh/auto)
   -conversation: 进入多轮对话模式 / Enter multi-turn conversation mode
   -verbose: 显示详细推理过程 / Show detailed reasoning process
-            """
-        )
-        
-        parser.add_argument(
-            '-question',
-            '--question',
-            type=str,
-            help='要查询的问题 / Question to query'
-        )
-        
-        parser.add_argument(
-            '-language',
-            '--language',
-            type=str,
-            default='auto',
-            choices=['en', 'zh', 'auto'],
-            help='语言设置: en(英文), zh(中文), auto(自动检测) / Language: en(English), zh(Chinese), auto(Auto-detect)'
-        )
-        
-        parser.add_argument(
-            '-conversation',
-            '--conversation',
-            action='store_true',
-            help='进入多轮对话模式 / Enter multi-turn conversation mode'
-        )
-        
-        parser.add_argument(
-            '-verbose',
-            '--verbose',
-            action='store_true',
-            help='显示详细推理过程 / Show detailed reasoning process'
-        )
-        
-        args = parser.parse_args()
-    finally:
-        # 恢复原始 sys.argv（虽然这里不需要，但保持代码整洁）
-        pass
+        """
+    )
+    
+    parser.add_argument(
+        '-question',
+        '--question',
+        type=str,
+        help='要查询的问题 / Question to query'
+    )
+    
+    parser.add_argument(
+        '-language',
+        '--language',
+        type=str,
+        default='auto',
+        metavar='{en,zh,auto}',
+        help='语言设置: en(英文), zh(中文), auto(自动检测) / Language: en(English), zh(Chinese), auto(Auto-detect)'
+    )
+    
+    parser.add_argument(
+        '-conversation',
+        '--conversation',
+        action='store_true',
+        help='进入多轮对话模式 / Enter multi-turn conversation mode'
+    )
+    
+    parser.add_argument(
+        '-verbose',
+        '--verbose',
+        action='store_true',
+        help='显示详细推理过程 / Show detailed reasoning process'
+    )
+    
+    return parser
+
+# 解析器在导入时构建一次并复用
+_PARSER = _build_parser()
+
+# 语言参数规范化（不区分大小写）
+_LANG_MAP = {'en': 'en', 'zh': 'zh', 'auto': 'auto'}
+
+def main():
+    """主函数"""
+    # 预处理参数，支持 -key:value 格式
+    sys.argv = parse_colon_args()
+    args = _PARSER.parse_args()
+    language = _LANG_MAP.get(args.language.lower())
+    if language is None:
+        _PARSER.error(f"argument -language/--language: invalid choice: {args.language!r} (choose from 'en', 'zh', 'auto')")
+    args.language = language
     
     # 打印横幅
     print_banner()
     
-    # 检查环境
+    # 检查环境（结果已缓存，查询函数中的检查不会重复执行）
     if not check_environment():
         sys.exit(1)
     
@@ -293,11 +367,12 @@ def main():
         single_query(args.question, language=args.language, verbose=args.verbose)
     else:
         # 没有提供问题，进入对话模式
-        print("ℹ️  未提供问题参数，进入多轮对话模式")
-        print("   No question provided, entering conversation mode")
-        print("   提示: 使用 -question:\"你的问题\" 进行单次查询")
-        print("   Tip: Use -question:\"your question\" for single query")
-        print()
+        sys.stdout.write(
+            "ℹ️  未提供问题参数，进入多轮对话模式\n"
+            "   No question provided, entering conversation mode\n"
+            "   提示: 使用 -question:\"你的问题\" 进行单次查询\n"
+            "   Tip: Use -question:\"your question\" for single query\n\n"
+        )
         conversation_mode(language=args.language, verbose=args.verbose)
 
 if __name__ == "__main__":
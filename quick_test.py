@@ -6,103 +6,121 @@ Quick test to verify ReAct PubMed Agent implementation works.
 import sys
 import os
 
-def test_basic_functionality():
-    """Test basic functionality without dependencies."""
-    print("🧬 ReAct PubMed Agent - Quick Test")
-    print("=" * 50)
+try:
+    import pytest
+except ImportError:  # pytest is only needed when collected as a test module
+    pytest = None
+
+
+def _make_config():
+    """Create an AgentConfig with a dummy API key."""
+    os.environ["OPENAI_API_KEY"] = "test_key"
+    from pubmed_agent.config import AgentConfig
     
-    # Test 1: Configuration system (Phase 1)
-    print("\n1. Testing Configuration System...")
-    try:
-        os.environ["OPENAI_API_KEY"] = "test_key"
-        from pubmed_agent.config import AgentConfig
-        
-        config = AgentConfig()
-        assert config.openai_api_key == "test_key"
-        assert config.temperature == 0.0
-        print("   ✅ Configuration works")
-    except Exception as e:
-        print(f"   ❌ Configuration failed: {e}")
-        return False
+    return AgentConfig()
+
+
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def config():
+        return _make_config()
+
+
+def test_configuration(config):
+    """Configuration system (Phase 1)."""
+    assert config.openai_api_key == "test_key"
+    assert config.temperature == 0.0
+    print("   ✅ Configuration works")
+
+
+def test_utilities():
+    """Utilities (Phase 3)."""
+    from pubmed_agent.utils import PubMedArticle, chunk_text
     
-    # Test 2: Utilities (Phase 3)
-    print("\n2. Testing Utilities...")
-    try:
-        from pubmed_agent.utils import PubMedArticle, chunk_text, classify_query_type
-        
-        article = PubMedArticle(
-            pmid="12345678",
-            title="Test",
-            abstract="Test abstract",
-            authors=["Test Author"],
-            journal="Test Journal",
-            publication_date="2023"
-        )
-        assert article.pmid == "12345678"
-        print("   ✅ PubMedArticle works")
-        
-        chunks = chunk_text("This is a test. " * 50, chunk_size=100, overlap=20)
-        assert len(chunks) > 1
-        print("   ✅ Text chunking works")
-    except Exception as e:
-        print(f"   ❌ Utilities failed: {e}")
-        return False
+    article = PubMedArticle(
+        pmid="12345678",
+        title="Test",
+        abstract="Test abstract",
+        authors=["Test Author"],
+        journal="Test Journal",
+        publication_date="2023"
+    )
+    assert article.pmid == "12345678"
+    print("   ✅ PubMedArticle works")
     
-    # Test 3: Prompt system (Phase 2 & 4)
-    print("\n3. Testing Prompt System...")
-    try:
-        from pubmed_agent.prompts import classify_query_type, get_react_prompt_template
-        
-        # Test query classification
-        mechanism_query = "How do vaccines work?"
-        assert classify_query_type(mechanism_query) == "mechanism"
-        print("   ✅ Query classification works")
-        
-        # Test prompt template
-        prompt = get_react_prompt_template("scientific")
-        assert "scientific research assistant" in prompt.template
-        print("   ✅ Prompt templates work")
-    except Exception as e:
-        print(f"   ❌ Prompts failed: {e}")
-        return False
+    chunks = chunk_text("This is a test. " * 50, chunk_size=100, overlap=20)
+    assert len(chunks) > 1
+    print("   ✅ Text chunking works")
+
+
+def test_prompt_system():
+    """Prompt system (Phase 2 & 4)."""
+    from pubmed_agent.prompts import classify_query_type, get_react_prompt_template
     
-    # Test 4: Tool system (Phase 1 & 5)
-    print("\n4. Testing Tool System...")
-    try:
-        from pubmed_agent.tools import create_tools
-        
-        config = AgentConfig()
-        tools = create_tools(config)
-        assert len(tools) == 3
-        tool_names = [tool.name for tool in tools]
-        assert "pubmed_search" in tool_names
-        assert "vector_store" in tool_names
-        assert "vector_search" in tool_names
-        print("   ✅ Tool system works")
-    except Exception as e:
-        print(f"   ❌ Tools failed: {e}")
-        return False
+    # Test query classification
+    mechanism_query = "How do vaccines work?"
+    assert classify_query_type(mechanism_query) == "mechanism"
+    print("   ✅ Query classification works")
     
-    # Test 5: Agent creation (All phases)
-    print("\n5. Testing Agent Creation...")
-    try:
-        from pubmed_agent.agent import PubMedAgent
-        
-        config = AgentConfig()
-        agent = PubMedAgent(config)
-        
-        # Test agent methods
-        stats = agent.get_agent_stats()
-        assert "total_tools" in stats
-        assert stats["total_tools"] == 3
-        print("   ✅ Agent creation works")
-        
-        available_tools = agent.get_available_tools()
-        assert len(available_tools) == 3
-        print("   ✅ Tool discovery works")
-    except Exception as e:
-        print(f"   ❌ Agent failed: {e}")
-        return False
+    # Test prompt template
+    prompt = get_react_prompt_template("scientific")
+    assert "scientific research assistant" in prompt.template
+    print("   ✅ Prompt templates work")
+
+
+def test_tool_system(config):
+    """Tool system (Phase 1 & 5)."""
+    from pubmed_agent.tools import create_tools
+    
+    tools = create_tools(config)
+    assert len(tools) == 3
+    tool_names = {tool.name for tool in tools}
+    assert {"pubmed_search", "vector_store", "vector_search"} <= tool_names
+    print("   ✅ Tool system works")
+
+
+def test_agent_creation(config):
+    """Agent creation (All phases)."""
+    from pubmed_agent.agent import PubMedAgent
+    
+    agent = PubMedAgent(config)
+    
+    # Test agent methods
+    stats = agent.get_agent_stats()
+    assert "total_tools" in stats
+    assert stats["total_tools"] == 3
+    print("   ✅ Agent creation works")
+    
+    available_tools = agent.get_available_tools()
+    assert len(available_tools) == 3
+    print("   ✅ Tool discovery works")
+
+
+def run_basic_functionality():
+    """Run every check in order without pytest, stopping at the first failure."""
+    print("🧬 ReAct PubMed Agent - Quick Test")
+    print("=" * 50)
+    
+    checks = [
+        ("1. Testing Configuration System...", "Configuration", test_configuration, True),
+        ("2. Testing Utilities...", "Utilities", test_utilities, False),
+        ("3. Testing Prompt System...", "Prompts", test_prompt_system, False),
+        ("4. Testing Tool System...", "Tools", test_tool_system, True),
+        ("5. Testing Agent Creation...", "Agent", test_agent_creation, True),
+    ]
+    config = None
+    for title, name, check, needs_config in checks:
+        print(f"\n{title}")
+        try:
+            if needs_config:
+                if config is None:
+                    config = _make_config()
+                check(config)
+            else:
+                check()
+        except Exception as e:
+            print(f"   ❌ {name} failed: {e}")
+            return False
     
     return True
 
@@ -111,7 +129,7 @@ def main():
     print("🚀 Testing ReAct PubMed Agent Implementation")
     print("All 5 Phases: ✅ COMPLETED")
     
-    if test_basic_functionality():
+    if run_basic_functionality():
         print("\n🎉 SUCCESS! All core functionality works!")
         print("\n📋 Implementation Summary:")
         print("   ✅ Phase 1: Basic infrastructure (Config, Utils, Tools)")
@@ -0,0 +1,133 @@
+"""Tests for ESummary request coalescing in pubmed_mcp.backend."""
+
+import dataclasses
+import threading
+import time
+
+import pytest
+
+from pubmed_mcp.backend import PubMedMCPBackend
+from pubmed_mcp.config import PubMedMCPConfig
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class _FakeHTTP:
+    """Records ESummary id lists; optionally delays or fails each request."""
+
+    def __init__(self, delay=0.0, error=None, on_request=None):
+        self.delay = delay
+        self.error = error
+        self.on_request = on_request
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None):
+        ids = params["id"].split(",") if params["id"] else []
+        with self._lock:
+            self.requests.append(ids)
+        if self.on_request is not None:
+            self.on_request()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return _FakeResponse({"result": {pmid: {"title": f"T{pmid}"} for pmid in ids}})
+
+
+@pytest.fixture
+def make_backend(tmp_path, monkeypatch):
+    monkeypatch.delenv("PUBMED_MCP_CACHE_DIR", raising=False)
+    monkeypatch.delenv("ABSTRACT_MODE", raising=False)
+
+    def _make(http, window_ms=200):
+        config = dataclasses.replace(PubMedMCPConfig.from_env(tmp_path), esummary_batch_window_ms=window_ms)
+        backend = PubMedMCPBackend(config)
+        backend.http = http
+        return backend
+
+    return _make
+
+
+def _run_concurrently(*calls):
+    results = [None] * len(calls)
+
+    def _call(index, func, args):
+        try:
+            results[index] = func(*args)
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=_call, args=(i, func, args)) for i, (func, args) in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_overlapping_callers_share_one_request(make_backend):
+    http = _FakeHTTP()
+    backend = make_backend(http)
+
+    first, second = _run_concurrently(
+        (backend.fetch_article_details, (["1", "2"],)),
+        (backend.fetch_article_details, (["2", "3"],)),
+    )
+
+    assert len(http.requests) == 1
+    assert sorted(http.requests[0]) == ["1", "2", "3"]
+    assert [a.pmid for a in first] == ["1", "2"]
+    assert [a.pmid for a in second] == ["2", "3"]
+
+
+def test_caller_with_all_pmids_in_flight_sends_no_request(make_backend):
+    http = _FakeHTTP(delay=0.3)
+    backend = make_backend(http, window_ms=20)
+
+    leader = threading.Thread(target=backend.fetch_article_details, args=(["1", "2"],))
+    leader.start()
+    time.sleep(0.1)  # leader has taken its batch and is waiting on the request
+    follower = backend.fetch_article_details(["1", "2"])
+    leader.join(timeout=10)
+
+    assert http.requests == [["1", "2"]]
+    assert [a.pmid for a in follower] == ["1", "2"]
+
+
+def test_leader_exception_reaches_every_waiter(make_backend):
+    http = _FakeHTTP(error=RuntimeError("esummary down"))
+    backend = make_backend(http)
+
+    results = _run_concurrently(
+        (backend.fetch_article_details, (["1"],)),
+        (backend.fetch_article_details, (["2"],)),
+    )
+
+    assert len(http.requests) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert backend._pending_pmids == {}
+    assert backend._batch_leader_active is False
+
+
+def test_zero_window_takes_direct_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("PUBMED_MCP_CACHE_DIR", raising=False)
+    monkeypatch.setenv("PUBMED_ESUMMARY_BATCH_WINDOW_MS", "0")
+    config = PubMedMCPConfig.from_env(tmp_path)
+    assert config.esummary_batch_window_ms == 0
+
+    backend = PubMedMCPBackend(config)
+    pending_during_request = []
+    http = _FakeHTTP(on_request=lambda: pending_during_request.append(dict(backend._pending_pmids)))
+    backend.http = http
+
+    articles = backend.fetch_article_details(["1", "2"])
+
+    assert http.requests == [["1", "2"]]
+    assert pending_during_request == [{}]
+    assert [a.pmid for a in articles] == ["1", "2"]
@@ -0,0 +1,9 @@
+"""Tests for pubmed_mcp.cache."""
+
+from pubmed_mcp.cache import read_json, write_json
+
+
+def test_write_json_accepts_bare_filename(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_json("index.json", {"pmids": ["1"]})
+    assert read_json("index.json") == {"pmids": ["1"]}
@@ -0,0 +1,60 @@
+"""Regression tests for pubmed_mcp.http."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pubmed_mcp.http import ProxyConfig, PubMedHTTPClient
+
+
+class _ForbiddenHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"forbidden" * 1024
+        self.send_response(403)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def forbidden_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ForbiddenHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/paper.pdf"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_failed_stream_get_releases_pooled_connection(forbidden_url):
+    client = PubMedHTTPClient(
+        ProxyConfig.build(False, None, None, None, None),
+        request_timeout_ms=5000,
+        rate_limit_delay_ms=0,
+        proxy_timeout=5,
+        proxy_retry_count=0,
+        # a distinct tool name gives this test its own pooled session
+        tool_name="test_failed_stream_get",
+    )
+    failures = []
+
+    def fetch_many():
+        # more attempts than the adapter's pool_maxsize of 20
+        for _ in range(30):
+            try:
+                client.get(forbidden_url, stream=True)
+            except requests.HTTPError:
+                failures.append(1)
+
+    worker = threading.Thread(target=fetch_many, daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+    assert not worker.is_alive(), "streamed GET blocked waiting for a pooled connection"
+    assert len(failures) == 30
@@ -0,0 +1,43 @@
+"""Tests for the query.py command-line helpers."""
+
+import uuid
+
+import pytest
+
+import query
+
+
+class _FakeAgent:
+    def __init__(self, language="auto"):
+        self.language = language
+        self._session_thread_id = None
+        self.memory_clears = 0
+
+    def clear_memory(self):
+        self.memory_clears += 1
+
+    def start_new_session(self):
+        self._session_thread_id = str(uuid.uuid4())
+        return self._session_thread_id
+
+    def query(self, question):
+        if self._session_thread_id is None:
+            self.start_new_session()
+        return {"success": True, "answer": question, "thread_id": self._session_thread_id}
+
+
+@pytest.fixture
+def fake_agent(monkeypatch):
+    monkeypatch.setattr(query, "PubMedAgent", _FakeAgent)
+    monkeypatch.setattr(query, "_agent_cache", {})
+    monkeypatch.setattr(query, "check_environment", lambda: True)
+    monkeypatch.setattr(query, "format_response", lambda response, verbose=False: None)
+
+
+def test_single_query_reuses_agent_with_fresh_session(fake_agent):
+    first = query.single_query("first", language="en")
+    second = query.single_query("second", language="en")
+
+    agent = query._agent_cache["en"]
+    assert agent.memory_clears == 1
+    assert first["thread_id"] != second["thread_id"]